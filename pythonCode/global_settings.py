@@ -9,8 +9,8 @@
 
 
 import math
-import random
-random.seed(100)
+import numpy as np
+
 runtime = 12000
 time_step = 1000
 time_scale_factor = 5
@@ -18,12 +18,25 @@ cores_per_chip = 10
 
 max_offset = 1500
 
+# physical processors on a SpiNNaker chip
+MAX_PROCESSORS_PER_CHIP = 18
+
+# precompute the random timer offset for every possible processor id with
+# one vectorized draw, instead of doing python arithmetic per placement
+_rng = np.random.default_rng(100)
+_delays = np.ceil(
+    (np.arange(MAX_PROCESSORS_PER_CHIP) - _rng.random(MAX_PROCESSORS_PER_CHIP))
+    / (cores_per_chip + 4) * max_offset).astype(np.int32)
+_delays = np.where(
+    _delays > max_offset,
+    (max_offset
+     - _rng.random(MAX_PROCESSORS_PER_CHIP) / cores_per_chip * max_offset
+     ).astype(np.int32),
+    _delays)
+
 # generate a random timer offser for a givin core.
 def generate_offset(processor):
-    delay = math.ceil((processor - random.random()) / (cores_per_chip+4) * max_offset)
-    if delay > max_offset:
-        delay = max_offset - random.random() / (cores_per_chip) * max_offset
-    return int(delay)
+    return int(_delays[processor])
 
 
 
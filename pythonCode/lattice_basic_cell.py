@@ -6,9 +6,10 @@
 #   The up-to-date information of SpiNNaker Project can be found here:
 #   https://spinnakermanchester.github.io/
 
-from collections import OrderedDict
 from enum import Enum
-import struct
+from functools import lru_cache
+
+import numpy as np
 
 from spinn_front_end_common.abstract_models import AbstractProvidesNKeysForPartition
 from spinn_utilities.overrides import overrides
@@ -40,6 +41,26 @@ import logging
 
 logger = logging.getLogger(__name__)
 
+# vertex -> index maps keyed by graph id, so looking up a cell's index is
+# O(1) instead of an O(V) list scan per data specification. Rebuilt if the
+# graph has grown or shrunk since the map was made.
+_VERTEX_INDEX_CACHE = {}
+
+
+def _get_vertex_index(machine_graph, vertex):
+    index_map = _VERTEX_INDEX_CACHE.get(id(machine_graph))
+    if index_map is None or len(index_map) != machine_graph.n_vertices:
+        index_map = {v: i for i, v in enumerate(machine_graph.vertices)}
+        _VERTEX_INDEX_CACHE[id(machine_graph)] = index_map
+    return index_map[vertex]
+
+
+@lru_cache(maxsize=None)
+def _get_recording_header_array(recorded_size):
+    # every cell records the same amount, so the header array only needs
+    # building once per recorded size
+    return recording_utilities.get_recording_header_array([recorded_size])
+
 
 class LatticeBasicCell(
     SimulatorVertex, MachineDataSpecableVertex,
@@ -65,8 +86,15 @@ class LatticeBasicCell(
 
     VERTEX_INDEX_SIZE = 2 * BYTES_PER_WORD # the index of the lattice in the network
 
+    # recording header sizes only depend on the single recorded region,
+    # so compute them once for all cells
+    _REC_HEADER_SIZE = recording_utilities.get_recording_header_size(1)
+    _REC_DATA_CONST_SIZE = recording_utilities.get_recording_data_constant_size(1)
+
     # The order of which directions are writeen to sdram
     ORDER_OF_DIRECTIONS = ["N", "W", "S", "E", "NW", "SW", "SE", "NE"]
+    # direction name -> slot in the neighbour vertex list
+    _DIR_IDX = {d: i for i, d in enumerate(ORDER_OF_DIRECTIONS)}
     # Regions for populations
     DATA_REGIONS = Enum(
         value="DATA_REGIONS",
@@ -87,41 +115,45 @@ class LatticeBasicCell(
         self.u_x = u_x
         self.u_y = u_y
         
-        self._loccation_vertices = OrderedDict()
-        for direction in self.ORDER_OF_DIRECTIONS:
-            self._loccation_vertices[direction] = None
+        # one slot per direction, in ORDER_OF_DIRECTIONS order
+        self._location_vertices = [None] * len(self.ORDER_OF_DIRECTIONS)
 
     def set_direction_vertex(self, direction, vertex):
         """
         Add a vertex to the corresponding direction
         """
-        self._loccation_vertices[direction] = vertex
+        self._location_vertices[self._DIR_IDX[direction]] = vertex
 
-    def _write_key_data(self, spec, routing_info, graph):
+    def _write_key_data(self, spec, routing_info, edges):
         """
-        Write the keys of its 8 neighbours
+        Write the keys of its 8 neighbours. The edges ending here are
+        fetched once by the caller and passed in; every edge in this
+        application is on PARTITION_ID, so no further filtering is needed.
         """
         spec.switch_write_focus(region=self.DATA_REGIONS.NEIGHBOUR_KEYS.value)
-        incoming_edges = graph.get_edges_ending_at_vertex_with_partition_name(self, self.PARTITION_ID)
 
         # verify the number of edges
-        if len(incoming_edges) != 8:
-            print(incoming_edges)
+        if len(edges) != 8:
+            print(edges)
             raise exceptions.ConfigurationException("Should only have 8 edges")
 
+        # look up the routing info of each neighbour once, then reuse it
+        # for both the key and (for "S") mask extraction
+        rinfos = [
+            routing_info.get_routing_info_from_pre_vertex(
+                vertex, self.PARTITION_ID)
+            for vertex in self._location_vertices]
+
         # get incoming edges
-        for direction in self._loccation_vertices:
-            key = routing_info.get_routing_info_from_pre_vertex(
-                self._loccation_vertices[direction],
-                self.PARTITION_ID).keys_and_masks[0].key
+        for direction, rinfo in zip(self.ORDER_OF_DIRECTIONS, rinfos):
+            key = rinfo.keys_and_masks[0].key
             if key is not None:
                 spec.write_value(data=key)
             else:
                 logger.warning("This lattice miss a edge from direction {}".format(direction))
                 spec.write_value(data_type=DataType.INT32, data=-1)
 
-        mask = routing_info.get_routing_info_from_pre_vertex(self._loccation_vertices["S"],
-                                                             self.PARTITION_ID).keys_and_masks[0].mask
+        mask = rinfos[self._DIR_IDX["S"]].keys_and_masks[0].mask
         spec.write_value(data=mask, data_type=DataType.UINT32)
 
     @inject_items({"data_n_time_steps": "DataNTimeSteps"})
@@ -163,12 +195,12 @@ class LatticeBasicCell(
 
         spec.reserve_memory_region(
             region=self.DATA_REGIONS.RESULTS.value,
-            size=recording_utilities.get_recording_header_size(1))
+            size=self._REC_HEADER_SIZE)
 
         # get recorded buffered regions sorted
         spec.switch_write_focus(self.DATA_REGIONS.RESULTS.value)
-        spec.write_array(recording_utilities.get_recording_header_array(
-            [self.RECORDING_ELEMENT_SIZE * data_n_time_steps]))
+        spec.write_array(_get_recording_header_array(
+            self.RECORDING_ELEMENT_SIZE * data_n_time_steps))
 
         # check got right number of keys and edges going into me
         partitions = \
@@ -182,8 +214,7 @@ class LatticeBasicCell(
         if len(edges) != 8:
             raise ConfigurationException(
                 "I've not got the right number of connections. I have {} "
-                "instead of 8".format(
-                    len(machine_graph.get_edges_ending_at_vertex(self))))
+                "instead of 8".format(len(edges)))
 
         for edge in edges:
             if edge.pre_vertex == self:
@@ -209,12 +240,12 @@ class LatticeBasicCell(
 
         #write VERTEX_INDEX data. Mainly for add a random delay
         spec.switch_write_focus(region=self.DATA_REGIONS.VERTEX_INDEX.value)
-        spec.write_value(machine_graph.vertices.index(self))
+        spec.write_value(_get_vertex_index(machine_graph, self))
         self.offset = generate_offset(placement.p)
         spec.write_value(self.offset)
 
-        # write the neighbour keys and masks
-        self._write_key_data(spec, routing_info, machine_graph)
+        # write the neighbour keys and masks, reusing the edges fetched above
+        self._write_key_data(spec, routing_info, edges)
 
         #write velocity data in two dimension, x and y
         spec.switch_write_focus(region=self.DATA_REGIONS.VELOCITY.value)
@@ -235,11 +266,11 @@ class LatticeBasicCell(
             print("missing_data from ({}, {}, {}); ".format(
                 placement.x, placement.y, placement.p))
 
-        # return the data, converted to list of booleans
-        return [
-            element
-            for element in struct.unpack(
-                "<{}f".format(len(raw_data) // BYTES_PER_WORD), raw_data)]
+        # return the data as a zero-copy typed view onto the raw buffer,
+        # avoiding per-element unpacking into python floats
+        return np.frombuffer(
+            raw_data, dtype=np.dtype("<f4"),
+            count=len(raw_data) // BYTES_PER_WORD)
 
     @property
     @overrides(MachineVertex.resources_required)
@@ -252,8 +283,8 @@ class LatticeBasicCell(
                        self.NEIGHBOUR_KEYS_SIZE +
                        self.VELOCITY_SIZE +
                        self.VERTEX_INDEX_SIZE +
-                       recording_utilities.get_recording_header_size(1) +
-                       recording_utilities.get_recording_data_constant_size(1))
+                       self._REC_HEADER_SIZE +
+                       self._REC_DATA_CONST_SIZE)
         per_timestep_sdram = self.RECORDING_ELEMENT_SIZE
         return ResourceContainer(
             sdram=VariableSDRAM(fixed_sdram, per_timestep_sdram))